@@ -8,28 +8,57 @@ Automatically skips binary files.
 """
 
 import os
+import re
 import sys
+import mmap
 import argparse
 import fnmatch
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Set, Tuple, Optional
 import mimetypes
 
+try:
+    import numpy as _np
+except ImportError:  # NumPy is optional; stdlib fallbacks are used without it
+    _np = None
+
 
 class GitignoreParser:
     """Parser for .gitignore files that determines if files should be ignored."""
 
+    # Cap on cached should_ignore results; oldest entries are evicted first.
+    _CACHE_MAX = 8192
+
     def __init__(self, gitignore_path: str):
-        self.gitignore_path = Path(gitignore_path)
-        self.base_dir = self.gitignore_path.parent
-        self.patterns = []
+        self.gitignore_path = gitignore_path
+        self.base_dir = os.path.dirname(gitignore_path)
+        # Simple ignore patterns partitioned by shape: literal basenames go
+        # in a set, "*.ext" patterns in a suffix tuple for name.endswith.
+        self._ignore_names: frozenset = frozenset()
+        self._ignore_suffixes: tuple = ()
+        # Combined alternation regexes, grouped by negation and whether the
+        # pattern only applies to directories; None when the group is empty.
+        self._ignore_re: Optional['re.Pattern'] = None
+        self._ignore_dir_re: Optional['re.Pattern'] = None
+        self._unignore_re: Optional['re.Pattern'] = None
+        self._unignore_dir_re: Optional['re.Pattern'] = None
+        self._cache: dict = {}
         self._parse_gitignore()
 
     def _parse_gitignore(self):
-        """Parse the .gitignore file and extract patterns."""
-        if not self.gitignore_path.exists():
+        """Parse the .gitignore file and compile its patterns to regexes."""
+        if not os.path.exists(self.gitignore_path):
             return
 
+        # Fragments per group: [negate][is_dir_only]
+        fragments = {(False, False): [], (False, True): [],
+                     (True, False): [], (True, True): []}
+        ignore_names = set()
+        ignore_suffixes = []
+
+        def is_literal(text):
+            return not any(c in text for c in '*?[/')
+
         with open(self.gitignore_path, 'r', encoding='utf-8', errors='ignore') as f:
             for line in f:
                 line = line.strip()
@@ -42,214 +71,422 @@ class GitignoreParser:
                 if negate:
                     line = line[1:]
 
-                self.patterns.append((line, negate))
-
-    def should_ignore(self, file_path: Path) -> bool:
-        """Check if a file should be ignored based on .gitignore patterns."""
+                # Directory patterns only apply to directories
+                is_dir_only = line.endswith('/')
+                if is_dir_only:
+                    line = line[:-1]
+
+                # Patterns with a trivial shape - a literal basename or a
+                # bare "*.ext" glob - cover most real .gitignore lines and
+                # are matched by set lookup / endswith instead of a regex
+                if not negate and not is_dir_only:
+                    if is_literal(line):
+                        ignore_names.add(line)
+                        continue
+                    if line.startswith('*.') and is_literal(line[1:]):
+                        ignore_suffixes.append(line[1:])
+                        continue
+
+                # Translate once: glob pattern matched against the relative
+                # path or any trailing sequence of its components, so "*.log"
+                # and "build" hit at any depth just like the old fnmatch loop.
+                fragments[(negate, is_dir_only)].append(
+                    r'(?:^|.*/)' + fnmatch.translate(line))
+
+        self._ignore_names = frozenset(ignore_names)
+        self._ignore_suffixes = tuple(ignore_suffixes)
+
+        # Join each group into one alternation so should_ignore runs a
+        # constant number of regex scans however many patterns there are.
+        def combine(group):
+            return re.compile('|'.join(group)) if group else None
+
+        self._ignore_re = combine(fragments[(False, False)])
+        self._ignore_dir_re = combine(fragments[(False, True)])
+        self._unignore_re = combine(fragments[(True, False)])
+        self._unignore_dir_re = combine(fragments[(True, True)])
+
+    def should_ignore(self, rel_path: str, name: str, is_dir: bool) -> Optional[bool]:
+        """
+        Check if a path should be ignored based on .gitignore patterns.
+        `rel_path` is the forward-slash path relative to this .gitignore's
+        directory and `name` its final component. Returns True (ignore),
+        False (explicitly included) or None (no pattern matched, so an outer
+        .gitignore may still decide).
+        """
         # Always include files with ".env" in the filename regardless of .gitignore
-        if '.env' in file_path.name:
+        if '.env' in name:
             return False
 
-        try:
-            # Get relative path from the .gitignore directory
-            rel_path = file_path.relative_to(self.base_dir)
-            rel_path_str = str(rel_path).replace('\\', '/')  # Use forward slashes
+        # Paths in the same directory are tested repeatedly with identical
+        # outcomes; memoize per path with FIFO eviction once the cap is hit.
+        if rel_path in self._cache:
+            return self._cache[rel_path]
 
+        # Negations win over ignores. The ignore test tries the cheap
+        # shapes first - set lookup, then suffix endswith - and only falls
+        # back to the regex groups for patterns that need them.
+        if (self._unignore_re and self._unignore_re.match(rel_path)) or \
+           (is_dir and self._unignore_dir_re and self._unignore_dir_re.match(rel_path)):
             ignored = False
-
-            for pattern, negate in self.patterns:
-                # Handle different pattern types
-                if pattern.endswith('/'):
-                    # Directory pattern
-                    pattern = pattern[:-1]
-                    if file_path.is_dir():
-                        if self._match_pattern(pattern, rel_path_str) or \
-                           self._match_pattern(pattern, file_path.name):
-                            ignored = not negate if negate else True
-                elif '/' in pattern:
-                    # Path pattern
-                    if self._match_pattern(pattern, rel_path_str):
-                        ignored = not negate if negate else True
-                else:
-                    # Filename pattern
-                    if self._match_pattern(pattern, file_path.name) or \
-                       self._match_pattern(pattern, rel_path_str):
-                        ignored = not negate if negate else True
-
-            return ignored
-
-        except ValueError:
-            # Path is not relative to base_dir
+        elif name in self._ignore_names or \
+                (self._ignore_suffixes and name.endswith(self._ignore_suffixes)) or \
+                (self._ignore_re and self._ignore_re.match(rel_path)) or \
+                (is_dir and self._ignore_dir_re and self._ignore_dir_re.match(rel_path)):
+            ignored = True
+        else:
+            ignored = None
+
+        if len(self._cache) >= self._CACHE_MAX:
+            del self._cache[next(iter(self._cache))]
+        self._cache[rel_path] = ignored
+
+        return ignored
+
+
+# Control bytes other than tab, newline and carriage return count as non-text.
+_NON_TEXT_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13))
+
+# How much of a file to read for the binary sniff before committing to a
+# full read.
+_SNIFF_SIZE = 8192
+
+# Files above this size are mmap'ed rather than read onto the heap.
+_MMAP_THRESHOLD = 256 * 1024
+
+# Directories that are never worth descending into, checked by name before
+# the .gitignore machinery runs at all.
+_SKIP_DIRS = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.tox', '.venv',
+    'venv', '.mypy_cache', '.pytest_cache', '.idea', '.vscode',
+})
+
+# Extensions that decide text-vs-binary up front, so the common case skips
+# the content sniff (and for binaries, the open) entirely.
+_TEXT_EXTS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.md', '.rst', '.txt', '.json',
+    '.yaml', '.yml', '.toml', '.ini', '.cfg', '.html', '.htm', '.css',
+    '.xml', '.csv', '.sh', '.bat', '.c', '.h', '.cpp', '.hpp', '.cs',
+    '.rs', '.go', '.java', '.kt', '.rb', '.php', '.pl', '.sql', '.lua',
+})
+_BINARY_EXTS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf',
+    '.zip', '.gz', '.bz2', '.xz', '.7z', '.tar', '.rar', '.so', '.dylib',
+    '.dll', '.exe', '.o', '.a', '.lib', '.class', '.jar', '.pyc', '.pyd',
+    '.woff', '.woff2', '.ttf', '.otf', '.mp3', '.mp4', '.avi', '.mov',
+    '.sqlite', '.db', '.bin',
+})
+
+
+def is_binary_data(file_path: str, chunk: bytes) -> bool:
+    """
+    Determine if a file is binary from its name and an initial chunk of its
+    content. Uses multiple heuristics for better accuracy.
+    """
+    # Check MIME type first
+    mime_type, _ = mimetypes.guess_type(file_path)
+    if mime_type:
+        if mime_type.startswith('text/'):
             return False
-
-    def _match_pattern(self, pattern: str, path: str) -> bool:
-        """Check if a pattern matches a path using glob-style matching."""
-        # Handle special cases
-        if pattern == path:
+        if mime_type.startswith(('image/', 'video/', 'audio/', 'application/octet-stream')):
             return True
 
-        # Use fnmatch for glob-style pattern matching
-        if fnmatch.fnmatch(path, pattern):
-            return True
+    if not chunk:
+        return False  # Empty file is not binary
 
-        # Check if pattern matches any part of the path
-        path_parts = path.split('/')
-        for i in range(len(path_parts)):
-            partial_path = '/'.join(path_parts[i:])
-            if fnmatch.fnmatch(partial_path, pattern):
-                return True
+    # Check for null bytes (strong indicator of binary)
+    if b'\x00' in chunk:
+        return True
 
-        return False
+    # Check for high ratio of non-text bytes. NumPy batch-classifies the
+    # chunk with SIMD reductions when available; otherwise translate with a
+    # delete table counts them in a single C pass instead of a per-byte loop.
+    if _np is not None:
+        arr = _np.frombuffer(chunk, dtype=_np.uint8)
+        non_text_bytes = int(((arr < 32) & (arr != 9) & (arr != 10) & (arr != 13)).sum())
+    else:
+        non_text_bytes = len(chunk) - len(chunk.translate(None, _NON_TEXT_BYTES))
+    if (non_text_bytes / len(chunk)) > 0.3:
+        return True
+
+    return False
 
 
-def is_binary_file(file_path: Path) -> bool:
+def compile_search_pattern(search_texts: List[str], case_sensitive: bool = True,
+                           fold_case: bool = False) -> 're.Pattern':
     """
-    Determine if a file is binary by checking its content.
-    Uses multiple heuristics for better accuracy.
+    Combine the search texts into a single bytes alternation regex so each
+    line is scanned once by the C regex engine instead of once per search
+    text, with no per-line Unicode decode. With fold_case the texts are
+    lowercased and the pattern compiled without IGNORECASE, for matching
+    against a buffer that the caller has already lowercased wholesale.
     """
-    try:
-        # Check MIME type first
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type:
-            if mime_type.startswith('text/'):
-                return False
-            if mime_type.startswith(('image/', 'video/', 'audio/', 'application/octet-stream')):
-                return True
-
-        # Read a small chunk to check for null bytes and non-text characters
-        with open(file_path, 'rb') as f:
-            chunk = f.read(8192)  # Read first 8KB
-
-        if not chunk:
-            return False  # Empty file is not binary
-
-        # Check for null bytes (strong indicator of binary)
-        if b'\x00' in chunk:
-            return True
+    texts = [text.encode('utf-8') for text in search_texts]
+    if fold_case:
+        texts = [text.lower() for text in texts]
+        flags = 0
+    else:
+        flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(b'|'.join(re.escape(text) for text in texts), flags)
 
-        # Check for high ratio of non-text bytes
-        non_text_bytes = sum(1 for byte in chunk if byte < 32 and byte not in (9, 10, 13))
-        if len(chunk) > 0 and (non_text_bytes / len(chunk)) > 0.3:
-            return True
 
-        return False
+def search_text_in_data(data: bytes, pattern: 're.Pattern',
+                        max_matches: Optional[int] = None,
+                        fold_case: bool = False) -> List[Tuple[int, str, str]]:
+    """
+    Search for the compiled pattern in file data and return matches with line
+    numbers. Returns list of (line_number, line_content, matched_text) tuples.
+    Lines are split without decoding; only matching lines pay for a decode,
+    when they are formatted for output. Stops early after max_matches hits.
+    With fold_case, the buffer is lowercased once up front (one C call rather
+    than one per line) and matched against a fold_case-compiled pattern;
+    reported lines and matched text keep their original case.
+    """
+    matches = []
+
+    if fold_case:
+        lines = zip(data.splitlines(), data.lower().splitlines())
+    else:
+        lines = ((line, line) for line in data.splitlines())
 
-    except (IOError, OSError, PermissionError):
-        return True  # Assume binary if we can't read it
+    for line_num, (line, search_line) in enumerate(lines, 1):
+        match = pattern.search(search_line)
+        if match:
+            matches.append((line_num,
+                            line.decode('utf-8', errors='ignore'),
+                            line[match.start():match.end()].decode('utf-8', errors='ignore')))
+            if max_matches is not None and len(matches) >= max_matches:
+                break
+
+    return matches
 
 
-def search_text_in_file(file_path: Path, search_texts: List[str], case_sensitive: bool = True) -> List[Tuple[int, str, str]]:
+def search_text_in_mmap(f, pattern: 're.Pattern',
+                        max_matches: Optional[int] = None) -> List[Tuple[int, str, str]]:
     """
-    Search for texts in a file and return matches with line numbers.
-    Returns list of (line_number, line_content, matched_text) tuples.
+    Search for the compiled pattern in an open file via mmap, so the regex
+    walks the page cache directly with no heap copy of the body. Reports the
+    first match per line like search_text_in_data; line numbers come from
+    counting newlines incrementally between match offsets.
     """
     matches = []
 
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                line_stripped = line.rstrip('\n\r')
-                search_line = line_stripped if case_sensitive else line_stripped.lower()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        nl_offsets = None  # vectorized newline index, built on first match
+        line_num = 1
+        counted_to = 0  # offset up to which line_num is accurate
+        while True:
+            match = pattern.search(mm, pos)
+            if match is None:
+                break
+
+            start = match.start()
+            if _np is not None:
+                # One vectorized pass indexes every newline; each match then
+                # binary-searches the table instead of rescanning the buffer
+                if nl_offsets is None:
+                    nl_offsets = _np.flatnonzero(
+                        _np.frombuffer(mm, dtype=_np.uint8) == 10)
+                line_num = int(_np.searchsorted(nl_offsets, start)) + 1
+            else:
+                line_num += mm[counted_to:start].count(b'\n')
+                counted_to = start
+            line_start = mm.rfind(b'\n', 0, start) + 1
+            line_end = mm.find(b'\n', start)
+            if line_end == -1:
+                line_end = len(mm)
+
+            line = mm[line_start:line_end].rstrip(b'\r')
+            matches.append((line_num,
+                            line.decode('utf-8', errors='ignore'),
+                            match.group(0).decode('utf-8', errors='ignore')))
+            if max_matches is not None and len(matches) >= max_matches:
+                break
+
+            # Resume on the next line to keep one reported match per line
+            pos = line_end + 1
 
-                for search_text in search_texts:
-                    if search_text in search_line:
-                        matches.append((line_num, line_stripped, search_text))
+    return matches
 
-    except (IOError, OSError, PermissionError, UnicodeDecodeError) as e:
-        print(f"Warning: Could not read {file_path}: {e}")
 
-    return matches
+def should_ignore_path(rel_path: str, name: str, is_dir: bool,
+                       parser_chain: Tuple[Tuple[int, GitignoreParser], ...]) -> bool:
+    """
+    Check a path against the chain of .gitignore parsers active at its location.
+    `rel_path` is relative to the search root; each chain entry carries the
+    length of its parser's directory prefix so the parser-relative path is a
+    plain slice. Parsers are consulted from innermost outward; the first one
+    with an opinion wins, matching git's semantics.
+    """
+    for prefix_len, parser in reversed(parser_chain):
+        parser_rel = rel_path if prefix_len == 0 else rel_path[prefix_len + 1:]
+        decision = parser.should_ignore(parser_rel, name, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+# Per-worker search parameters, set once by _init_worker so they are not
+# re-pickled with every task sent to the pool. _worker_pattern matches the
+# (possibly case-folded) in-memory buffer; _worker_mmap_pattern keeps engine
+# case folding for mmap'ed files, which cannot be lowercased without copying.
+_worker_pattern: Optional['re.Pattern'] = None
+_worker_mmap_pattern: Optional['re.Pattern'] = None
+_worker_fold_case = False
+_worker_max_matches: Optional[int] = None
+
+
+def _init_worker(search_texts: List[str], case_sensitive: bool,
+                 max_matches_per_file: Optional[int]):
+    """Initialize a scan worker process with the shared search parameters."""
+    global _worker_pattern, _worker_mmap_pattern, _worker_fold_case, _worker_max_matches
+    _worker_fold_case = not case_sensitive
+    _worker_pattern = compile_search_pattern(search_texts, case_sensitive,
+                                             fold_case=_worker_fold_case)
+    _worker_mmap_pattern = (_worker_pattern if case_sensitive
+                            else compile_search_pattern(search_texts, case_sensitive))
+    _worker_max_matches = max_matches_per_file
+
+
+def _scan_one(path: str) -> Tuple[str, Optional[List[Tuple[int, str, str]]]]:
+    """
+    Scan a single candidate file in a worker process.
+    Returns (path, matches), with matches None for binary or unreadable files.
+    """
+    # Known extensions decide without touching the file content
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _BINARY_EXTS:
+        return path, None
 
+    try:
+        # One open per file: sniff the first chunk for the binary check,
+        # then read the remainder from the same handle instead of paying a
+        # second open+read round trip. Known-text extensions skip the sniff.
+        with open(path, 'rb') as f:
+            chunk = b'' if ext in _TEXT_EXTS else f.read(_SNIFF_SIZE)
+            if chunk and is_binary_data(path, chunk):
+                return path, None
+
+            # Large files are searched through mmap to avoid copying the
+            # whole body onto the heap
+            if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+                return path, search_text_in_mmap(f, _worker_mmap_pattern, _worker_max_matches)
+
+            if chunk and len(chunk) < _SNIFF_SIZE:
+                data = chunk  # The whole file fit in the sniff
+            else:
+                data = chunk + f.read()
+    except (IOError, OSError, PermissionError):
+        return path, None  # Treat unreadable files like binary ones
 
-def find_gitignore_parsers(directory: Path) -> dict:
-    """Find all .gitignore files in the directory tree and create parsers."""
-    parsers = {}
+    return path, search_text_in_data(data, _worker_pattern, _worker_max_matches,
+                                     _worker_fold_case)
 
-    for root, dirs, files in os.walk(directory):
-        root_path = Path(root)
-        if '.gitignore' in files:
-            gitignore_path = root_path / '.gitignore'
-            parsers[root_path] = GitignoreParser(str(gitignore_path))
 
-    return parsers
+# Candidate files handed to a worker per task; results come back as one list
+# so each worker-to-main handoff is amortized over many files.
+_SCAN_BATCH = 128
 
 
-def get_applicable_parser(file_path: Path, parsers: dict) -> Optional[GitignoreParser]:
-    """Get the most specific .gitignore parser that applies to a file."""
-    applicable_parser = None
-    max_depth = -1
+def _scan_chunk(paths: List[str]) -> List[Tuple[str, Optional[List[Tuple[int, str, str]]]]]:
+    """Scan a batch of candidate files in a worker process."""
+    return [_scan_one(path) for path in paths]
 
-    for parser_dir, parser in parsers.items():
-        try:
-            # Check if the file is under this parser's directory
-            file_path.relative_to(parser_dir)
-            # Count depth to find most specific parser
-            depth = len(file_path.relative_to(parser_dir).parts)
-            if depth > max_depth:
-                max_depth = depth
-                applicable_parser = parser
-        except ValueError:
-            # File is not under this directory
-            continue
 
-    return applicable_parser
+def _batched(iterable, size: int):
+    """Yield lists of up to size items from iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
-def search_directory(directory: Path, search_texts: List[str], case_sensitive: bool = True) -> dict:
+def search_directory(directory: str, search_texts: List[str], case_sensitive: bool = True,
+                     max_matches_per_file: Optional[int] = None):
     """
     Recursively search directory for text occurrences.
-    Returns dict mapping file paths to their matches.
+    Yields (file_path, matches) tuples as files finish scanning, so results
+    appear immediately instead of accumulating in memory.
     """
-    results = {}
-
-    # Find all .gitignore parsers in the directory tree
-    print(f"Scanning for .gitignore files in {directory}...")
-    gitignore_parsers = find_gitignore_parsers(directory)
-    print(f"Found {len(gitignore_parsers)} .gitignore files")
-
     files_processed = 0
     files_skipped = 0
 
-    for root, dirs, files in os.walk(directory):
-        root_path = Path(root)
+    def iter_candidates():
+        """
+        Depth-first walk over os.scandir with plain strings: DirEntry.is_dir()
+        and is_file() come straight from the directory listing, and the
+        root-relative path is accumulated instead of recomputed per entry.
+        Each pending directory carries the chain of (prefix length, parser)
+        for the .gitignore files governing it, outermost first.
+        """
+        nonlocal files_skipped
+        pending = [(directory, '', ())]
 
-        # Filter directories based on .gitignore rules
-        dirs_to_remove = []
-        for dir_name in dirs:
-            dir_path = root_path / dir_name
-            parser = get_applicable_parser(dir_path, gitignore_parsers)
-            if parser and parser.should_ignore(dir_path):
-                dirs_to_remove.append(dir_name)
+        while pending:
+            dir_path, rel_dir, parser_chain = pending.pop()
 
-        for dir_name in dirs_to_remove:
-            dirs.remove(dir_name)
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
 
-        # Process files
-        for file_name in files:
-            file_path = root_path / file_name
+            # A .gitignore here scopes everything below; parse it lazily,
+            # the first (and only) time the walk reaches this directory
+            for entry in entries:
+                if entry.name == '.gitignore' and not entry.is_dir(follow_symlinks=False):
+                    parser_chain = parser_chain + \
+                        ((len(rel_dir), GitignoreParser(entry.path)),)
+                    break
+
+            for entry in entries:
+                name = entry.name
+                rel_path = name if not rel_dir else rel_dir + '/' + name
+                is_dir = entry.is_dir(follow_symlinks=False)
+
+                # Well-known junk directories are skipped by name without
+                # consulting any .gitignore
+                if is_dir and name in _SKIP_DIRS:
+                    continue
 
-            # Check if file should be ignored by .gitignore
-            parser = get_applicable_parser(file_path, gitignore_parsers)
-            if parser and parser.should_ignore(file_path):
-                files_skipped += 1
-                continue
+                # Check the entry against the .gitignore chain
+                if should_ignore_path(rel_path, name, is_dir, parser_chain):
+                    if not is_dir:
+                        files_skipped += 1
+                    continue
 
-            # Skip binary files
-            if is_binary_file(file_path):
-                files_skipped += 1
-                continue
+                if is_dir:
+                    pending.append((entry.path, rel_path, parser_chain))
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+    # The walk and .gitignore filtering stay in the main process (stateful
+    # and cheap); binary sniffing and searching fan out to worker processes
+    # in batches, so both task submission and the result traffic back over
+    # the multiprocessing pipe are amortized over many files.
+    with ProcessPoolExecutor(initializer=_init_worker,
+                             initargs=(search_texts, case_sensitive,
+                                       max_matches_per_file)) as executor:
+        for chunk_results in executor.map(_scan_chunk,
+                                          _batched(iter_candidates(), _SCAN_BATCH)):
+            for path, matches in chunk_results:
+                if matches is None:
+                    # Binary file
+                    files_skipped += 1
+                    continue
 
-            # Search for text in the file
-            matches = search_text_in_file(file_path, search_texts, case_sensitive)
-            if matches:
-                results[str(file_path)] = matches
+                if matches:
+                    yield path, matches
 
-            files_processed += 1
-            if files_processed % 100 == 0:
-                print(f"Processed {files_processed} files...")
+                files_processed += 1
+                if files_processed % 100 == 0:
+                    print(f"Processed {files_processed} files...")
 
     print(f"Completed: {files_processed} files processed, {files_skipped} files skipped")
-    return results
 
 
 def main():
@@ -289,67 +526,71 @@ Examples:
         help='Perform case-sensitive search (default: case-insensitive)'
     )
 
+    parser.add_argument(
+        '--max-matches-per-file',
+        type=int,
+        metavar='N',
+        help='Stop scanning a file after N matches (default: no limit)'
+    )
+
     args = parser.parse_args()
 
     # Validate directory
-    search_dir = Path(args.directory).resolve()
-    if not search_dir.exists():
+    search_dir = os.path.realpath(args.directory)
+    if not os.path.exists(search_dir):
         print(f"Error: Directory '{search_dir}' does not exist")
         sys.exit(1)
 
-    if not search_dir.is_dir():
+    if not os.path.isdir(search_dir):
         print(f"Error: '{search_dir}' is not a directory")
         sys.exit(1)
 
-    # Prepare search texts
+    # Case folding is handled by the compiled search pattern
     search_texts = args.search_texts
     case_sensitive = args.case_sensitive
-    if not case_sensitive:
-        search_texts = [text.lower() for text in search_texts]
 
     print(f"Searching for: {', '.join(repr(text) for text in args.search_texts)}")
     print(f"In directory: {search_dir}")
     print(f"Case sensitive: {case_sensitive}")
     print()
 
-    # Perform search
+    # Open the output sink up front so results stream as they arrive
+    out = sys.stdout
+    if args.output:
+        try:
+            out = open(args.output, 'w', encoding='utf-8')
+        except IOError as e:
+            print(f"Error opening output file: {e}")
+            print("Printing results to console instead")
+
+    matched_files = 0
+    total_matches = 0
+
+    # Perform search, writing each file's matches as soon as they arrive
     try:
-        results = search_directory(search_dir, search_texts, case_sensitive)
+        for file_path, matches in search_directory(search_dir, search_texts, case_sensitive,
+                                                   args.max_matches_per_file):
+            out.write(f"File: {file_path}\n")
+            for line_num, line_content, matched_text in matches:
+                out.write(f"  Line {line_num}: {line_content}\n")
+                total_matches += 1
+            out.write("\n")  # Empty line between files
+            matched_files += 1
+
+        if matched_files:
+            out.write(f"Found matches in {matched_files} files\n")
+            out.write(f"Total matches: {total_matches}\n")
     except KeyboardInterrupt:
         print("\nSearch interrupted by user")
         sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
-    # Format and output results
-    if not results:
+    if not matched_files:
         print("No matches found.")
-        return
-
-    output_lines = []
-    total_matches = 0
-
-    output_lines.append(f"Found matches in {len(results)} files:\n")
-
-    for file_path, matches in sorted(results.items()):
-        output_lines.append(f"File: {file_path}")
-        for line_num, line_content, matched_text in matches:
-            output_lines.append(f"  Line {line_num}: {line_content}")
-            total_matches += 1
-        output_lines.append("")  # Empty line between files
-
-    output_lines.append(f"Total matches: {total_matches}")
-    output_text = "\n".join(output_lines)
-
-    # Output results
-    if args.output:
-        try:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(output_text)
-            print(f"Results saved to: {args.output}")
-        except IOError as e:
-            print(f"Error saving to file: {e}")
-            print(output_text)
-    else:
-        print(output_text)
+    elif out is not sys.stdout:
+        print(f"Results saved to: {args.output}")
 
 
 if __name__ == "__main__":